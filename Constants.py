@@ -1,19 +1,29 @@
 """Project constants (Phase 1 scaffold + Phase 1B heuristics)."""
 
+import os
+import sys
 from pathlib import Path
 
 CATEGORIES_FILE = Path("categories.json")
 TRACE_FILE = Path("trace.txt")
+# Tracing is on by default; set TRACE_ENABLED=0 to skip trace formatting/IO.
+TRACE_ENABLED = os.environ.get("TRACE_ENABLED", "1") != "0"
 SAMPLES_PATH = "samples.json"
-ALLOWED_MUTABLE_FIELDS = {"category", "priority"}
-REQUIRED_EMAIL_FIELDS = ("date", "from", "subject", "priority", "category", "body")
-PLACEHOLDER_CATEGORY = "Archive"
-PLACEHOLDER_PRIORITY = "normal"
+# Interned so repeated membership tests and dict lookups against runtime
+# strings resolve by pointer compare whenever both sides are interned.
+ALLOWED_MUTABLE_FIELDS = frozenset(map(sys.intern, ("category", "priority")))
+REQUIRED_EMAIL_FIELDS = tuple(
+    map(sys.intern, ("date", "from", "subject", "priority", "category", "body"))
+)
+PLACEHOLDER_CATEGORY = sys.intern("Archive")
+PLACEHOLDER_PRIORITY = sys.intern("normal")
 
-OPERATIONAL_CATEGORIES_TO_SKIP = {"Inbox", "Drafts", "Sent", "Trash"}
-SPECIAL_CATEGORY_JUNK = "Junk"
-SPECIAL_CATEGORY_ARCHIVE = "Archive"
-ALLOWED_PRIORITIES = {"high", "normal"}
+OPERATIONAL_CATEGORIES_TO_SKIP = frozenset(
+    map(sys.intern, ("Inbox", "Drafts", "Sent", "Trash"))
+)
+SPECIAL_CATEGORY_JUNK = sys.intern("Junk")
+SPECIAL_CATEGORY_ARCHIVE = sys.intern("Archive")
+ALLOWED_PRIORITIES = frozenset(map(sys.intern, ("high", "normal")))
 
 MIN_CATEGORY_SCORE = 3
 MIN_CATEGORY_MARGIN = 2
@@ -26,6 +36,10 @@ W_BODY = 1
 
 LINK_DENSITY_THRESHOLD = 3
 
+# Below this many emails, process-pool spawn overhead outweighs the win.
+PARALLEL_MIN_EMAILS = 256
+PARALLEL_CHUNKSIZE = 64
+
 MIN_FROM_HITS = 1
 MIN_DOMAIN_HITS = 2
 MIN_DOMAIN_RATIO = 0.6
@@ -1,9 +1,34 @@
 """Deterministic heuristic classifier for Phase 1B."""
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 from pathlib import Path
+import functools
+import heapq
 import json
+import os
+import pickle
 import re
+import sys
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional speedup; scoring falls back to per-term regex matching.
+    ahocorasick = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Optional speedup; link counting falls back to the compiled regex.
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:
+    # Optional speedup; phrase checks fall back to the alternation regexes.
+    hyperscan = None
 
 from Constants import (
     ALLOWED_PRIORITIES,
@@ -58,24 +83,161 @@ HIGH_PRIORITY_PHRASES = (
     "need your",
 )
 
+# Single pre-compiled alternations: one C-level scan per phrase group instead
+# of a Python-level `any(phrase in ...)` loop over each tuple. Every needle is
+# pure ASCII, so the patterns compile over bytes and run against one
+# ASCII-encoded combined haystack built per email (bytes.find/search have a
+# tighter hot loop than their str counterparts).
+def _phrase_alternation(phrases: tuple[str, ...]) -> re.Pattern[bytes]:
+    return re.compile(b"|".join(re.escape(phrase.encode()) for phrase in phrases))
+
+
+_PROMO_RE = _phrase_alternation(PROMOTIONAL_WORDS)
+_SCAM_RE = _phrase_alternation(SCAM_PHRASES)
+_HIPRI_RE = _phrase_alternation(HIGH_PRIORITY_PHRASES)
+
+# With hyperscan installed, all three phrase groups match in one SIMD pass;
+# match ids encode which bucket each phrase belongs to.
+_PHRASE_BUCKET_PROMO = 0
+_PHRASE_BUCKET_SCAM = 1
+_PHRASE_BUCKET_HIPRI = 2
+
+_PHRASE_DB: Any | None = None
+
+
+def _build_phrase_db() -> Any | None:
+    global _PHRASE_DB
+    if hyperscan is None:
+        return None
+    if _PHRASE_DB is not None:
+        return _PHRASE_DB
+
+    expressions: list[bytes] = []
+    ids: list[int] = []
+    for bucket, phrases in (
+        (_PHRASE_BUCKET_PROMO, PROMOTIONAL_WORDS),
+        (_PHRASE_BUCKET_SCAM, SCAM_PHRASES),
+        (_PHRASE_BUCKET_HIPRI, HIGH_PRIORITY_PHRASES),
+    ):
+        for phrase in phrases:
+            expressions.append(re.escape(phrase).encode())
+            ids.append(bucket)
+
+    db = hyperscan.Database()
+    db.compile(expressions=expressions, ids=ids, elements=len(expressions))
+    _PHRASE_DB = db
+    return db
+
+
+def _scan_phrase_buckets(combined: bytes) -> set[int] | None:
+    """Bucket ids that hit in one multi-pattern scan, or None without hyperscan."""
+    db = _build_phrase_db()
+    if db is None:
+        return None
+
+    hits: set[int] = set()
+    db.scan(
+        combined,
+        match_event_handler=lambda pattern_id, start, end, flags, ctx: hits.add(pattern_id),
+    )
+    return hits
+
+
+_LINK_RE = re.compile(rb"https?|www")
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_link_markers(data: bytes) -> int:
+        # One fused non-overlapping pass over the haystack for both markers,
+        # compiled to a tight native loop; counts match _LINK_RE.findall.
+        # Byte values spelled out (h=104, t=116, p=112, w=119) because numba
+        # indexes bytes as integers.
+        count = 0
+        i = 0
+        n = len(data)
+        while i < n:
+            ch = data[i]
+            if (
+                ch == 104
+                and i + 3 < n
+                and data[i + 1] == 116
+                and data[i + 2] == 116
+                and data[i + 3] == 112
+            ):
+                count += 1
+                i += 4
+            elif (
+                ch == 119
+                and i + 2 < n
+                and data[i + 1] == 119
+                and data[i + 2] == 119
+            ):
+                count += 1
+                i += 3
+            else:
+                i += 1
+        return count
+else:
+    def _count_link_markers(data: bytes) -> int:
+        return len(_LINK_RE.findall(data))
+
 _DOMAIN_TO_CATEGORY_CACHE: dict[str, tuple[str, float, int]] | None = None
 _FROM_TO_CATEGORY_CACHE: dict[str, tuple[str, int]] | None = None
 _CACHE_KEY: tuple[str, ...] | None = None
 
+_CATEGORY_AUTOMATON_CACHE: Any | None = None
+_AUTOMATON_CACHE_KEY: tuple[str, ...] | None = None
+
+# Bounded memo of final labels keyed on the classified content; duplicate
+# newsletters/notifications skip the whole scoring pipeline.
+_LABEL_CACHE: OrderedDict[tuple, tuple[str, str, dict[str, str]]] = OrderedDict()
+_LABEL_CACHE_MAX = 4096
+
 
 CAMEL_CASE_BOUNDARY = re.compile(r"([a-z])([A-Z])")
 ALNUM_CHUNKS = re.compile(r"[a-z0-9]+")
 
-
-def _token_pattern(text: str) -> re.Pattern[str]:
-    return re.compile(rf"(?<![a-z0-9]){re.escape(text)}(?![a-z0-9])")
+# The boundary class for category matching is exactly [a-z0-9], mirroring the
+# original lookaround pattern: non-ASCII alphanumerics (accented letters and
+# the like) count as boundaries. str.isalnum() must not be used here -- it is
+# Unicode-aware and would reject those neighbors.
+_ASCII_ALNUM = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+# One-pass parse of the common From shapes: 'Display <local@domain>' and a
+# bare 'local@domain'. Anything else falls back to the partition-based path.
+# The bare alternative excludes angle brackets on both sides of the @ so any
+# field containing <> -- bracketed addresses with odd display names,
+# malformed strings -- takes the fallback's partition semantics instead.
+_FROM_RE = re.compile(
+    r"^\s*(?:"
+    r'"?(?P<display>[^"<]*?)"?\s*<(?P<local>[^@>]+)@(?P<domain>[^>]+)>'
+    r"|(?P<local2>[^@\s<>]+)@(?P<domain2>[^\s<>]+)"
+    r")\s*$"
+)
 
 
 def _has_boundary_match(haystack: str, needle: str) -> bool:
+    """True when needle occurs with non-[a-z0-9] neighbors on both sides.
+
+    str.find's C fast path beats the regex engine for short needles like
+    category names, so no pattern compilation is involved at all.
+    """
     if not needle:
         return False
-    pattern = _token_pattern(needle)
-    return pattern.search(haystack) is not None
+
+    needle_length = len(needle)
+    haystack_length = len(haystack)
+    start = 0
+    while True:
+        index = haystack.find(needle, start)
+        if index < 0:
+            return False
+        end = index + needle_length
+        left_ok = index == 0 or haystack[index - 1] not in _ASCII_ALNUM
+        right_ok = end == haystack_length or haystack[end] not in _ASCII_ALNUM
+        if left_ok and right_ok:
+            return True
+        start = index + 1
 
 
 def extract_sender_email(from_field: str) -> str:
@@ -102,6 +264,31 @@ def _split_sender_tokens(text: str) -> list[str]:
 
 
 def _extract_sender_parts(from_field: str) -> tuple[str, str, str, str]:
+    match = _FROM_RE.match(from_field)
+    if match is None:
+        return _extract_sender_parts_fallback(from_field)
+
+    if match.group("local") is not None:
+        display = match.group("display")
+        sender_email = from_field[match.start("local"):match.end("domain")].strip().lower()
+        domain = match.group("domain").strip().lower()
+        local_part = match.group("local").lower()
+    else:
+        display = from_field.strip()
+        sender_email = display.lower()
+        domain = match.group("domain2").lower()
+        local_part = match.group("local2").lower()
+
+    # Tokenize the display before lowercasing so camel-case boundaries still
+    # split; the local part is tokenized lowercased, as before.
+    token_parts = _split_sender_tokens(display)
+    token_parts.extend(_split_sender_tokens(local_part))
+    sender_token_joined = " ".join(token_parts)
+
+    return display.lower(), sender_email, domain, sender_token_joined
+
+
+def _extract_sender_parts_fallback(from_field: str) -> tuple[str, str, str, str]:
     value = from_field.strip()
     if "<" in value and ">" in value:
         left, _, _ = value.partition("<")
@@ -120,41 +307,169 @@ def _extract_sender_parts(from_field: str) -> tuple[str, str, str, str]:
     return display.lower(), sender_email, domain, sender_token_joined
 
 
-def _operational_candidates(categories: list[str]) -> list[str]:
-    return [
-        category
-        for category in categories
-        if category not in OPERATIONAL_CATEGORIES_TO_SKIP
-        and category not in {SPECIAL_CATEGORY_JUNK, SPECIAL_CATEGORY_ARCHIVE}
-    ]
+# Categories the classifier may never assign directly: operational folders
+# plus the Junk/Archive specials reserved for override/fallback logic.
+_NON_ASSIGNABLE_CATEGORIES = frozenset(OPERATIONAL_CATEGORIES_TO_SKIP) | {
+    SPECIAL_CATEGORY_JUNK,
+    SPECIAL_CATEGORY_ARCHIVE,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _operational_candidates_cached(categories_key: tuple[str, ...]) -> tuple[str, ...]:
+    # Interned candidate names make downstream dict/set lookups pointer compares.
+    return tuple(
+        sys.intern(category)
+        for category in categories_key
+        if category not in _NON_ASSIGNABLE_CATEGORIES
+    )
+
 
+def operational_candidates(categories: list[str]) -> tuple[str, ...]:
+    """Assignable candidate categories, cached per distinct category inventory."""
+    return _operational_candidates_cached(tuple(categories))
 
-def _score_candidate(
-    category: str,
+
+@dataclass(frozen=True)
+class ClassifierContext:
+    """Per-run classification state that is identical for every email."""
+
+    categories: tuple[str, ...]
+    candidates: tuple[str, ...]
+    lower_terms: tuple[str, ...]
+    # Single-token terms matched via set lookup; multi-word terms via scan.
+    # Each term maps to every candidate that lowers to it, so case-colliding
+    # category names all score and keep their zero-margin tie.
+    token_term_to_category: dict[str, tuple[str, ...]]
+    phrase_terms: tuple[tuple[str, str], ...]
+    domain_map: dict[str, tuple[str, float, int]]
+    from_map: dict[str, tuple[str, int]]
+    automaton: Any
+    # Hash of the finalized learned maps: identical learned content yields
+    # the same token however it was loaded, and distinct content can never
+    # alias the way a recycled id(samples) could.
+    samples_token: int
+
+
+def build_context(categories: list[str], samples: Any = None) -> ClassifierContext:
+    """Validate categories and precompute everything label_email reuses per email."""
+    _validate_required_categories(categories)
+
+    candidates = operational_candidates(categories)
+    domain_map, from_map = _load_learned_maps(categories, samples)
+
+    lower_terms = tuple(category.lower() for category in candidates)
+    token_term_to_category: dict[str, tuple[str, ...]] = {}
+    phrase_terms: list[tuple[str, str]] = []
+    for category, term in zip(candidates, lower_terms):
+        if ALNUM_CHUNKS.fullmatch(term):
+            token_term_to_category[term] = (
+                token_term_to_category.get(term, ()) + (category,)
+            )
+        else:
+            phrase_terms.append((category, term))
+
+    return ClassifierContext(
+        categories=tuple(map(sys.intern, categories)),
+        candidates=candidates,
+        lower_terms=lower_terms,
+        token_term_to_category=token_term_to_category,
+        phrase_terms=tuple(phrase_terms),
+        domain_map=domain_map,
+        from_map=from_map,
+        automaton=_build_category_automaton(candidates),
+        samples_token=hash(
+            (
+                tuple(sorted(domain_map.items())),
+                tuple(sorted(from_map.items())),
+            )
+        ),
+    )
+
+
+def _build_category_automaton(candidates: tuple[str, ...]) -> Any | None:
+    """Compile all candidate terms into one multi-pattern automaton (cached)."""
+    global _CATEGORY_AUTOMATON_CACHE, _AUTOMATON_CACHE_KEY
+
+    if ahocorasick is None:
+        return None
+    if _CATEGORY_AUTOMATON_CACHE is not None and _AUTOMATON_CACHE_KEY == candidates:
+        return _CATEGORY_AUTOMATON_CACHE
+
+    # Group candidates by lowered term first: add_word keeps only the last
+    # payload per word, so case-colliding names must share one entry.
+    terms: dict[str, tuple[str, ...]] = {}
+    for category in candidates:
+        term = category.lower()
+        terms[term] = terms.get(term, ()) + (category,)
+
+    automaton = ahocorasick.Automaton()
+    for term, term_categories in terms.items():
+        automaton.add_word(term, (len(term), term_categories))
+    automaton.make_automaton()
+
+    _CATEGORY_AUTOMATON_CACHE = automaton
+    _AUTOMATON_CACHE_KEY = candidates
+    return automaton
+
+
+def _matched_categories(haystack: str, context: ClassifierContext) -> set[str]:
+    automaton = context.automaton
+    if automaton is None:
+        # Invert the loop: tokenize the haystack once and look each token up
+        # in the term dict, instead of scanning once per candidate. Tokens
+        # are maximal [a-z0-9] runs and the boundary class is the same set,
+        # so a dict hit is already a boundary match; multi-word terms can't
+        # be set members, so they keep the per-term scan.
+        matched: set[str] = set()
+        for token in set(ALNUM_CHUNKS.findall(haystack)):
+            token_categories = context.token_term_to_category.get(token)
+            if token_categories is not None:
+                matched.update(token_categories)
+        for category, term in context.phrase_terms:
+            if category not in matched and _has_boundary_match(haystack, term):
+                matched.add(category)
+        return matched
+
+    matched: set[str] = set()
+    for end_index, (term_length, term_categories) in automaton.iter(haystack):
+        start = end_index - term_length + 1
+        # Enforce the same [a-z0-9] lookaround boundaries as the original
+        # per-term pattern; the empty slice at either edge never hits.
+        if haystack[start - 1:start] in _ASCII_ALNUM:
+            continue
+        if haystack[end_index + 1:end_index + 2] in _ASCII_ALNUM:
+            continue
+        matched.update(term_categories)
+    return matched
+
+
+def _score_all_candidates(
+    context: ClassifierContext,
     sender_display: str,
     sender_email: str,
     sender_domain: str,
     sender_token_joined: str,
     subject: str,
     body_snippet: str,
-) -> int:
-    term = category.lower()
-    score = 0
-
-    if (
-        _has_boundary_match(sender_display, term)
-        or _has_boundary_match(sender_email, term)
-        or _has_boundary_match(sender_token_joined, term)
-    ):
-        score += W_FROM
-    if _has_boundary_match(sender_domain, term):
-        score += W_DOMAIN
-    if _has_boundary_match(subject, term):
-        score += W_SUBJECT
-    if _has_boundary_match(body_snippet, term):
-        score += W_BODY
+) -> dict[str, int]:
+    scores = dict.fromkeys(context.candidates, 0)
+
+    # Each weight is granted at most once per candidate per field group.
+    weighted_groups = (
+        (W_FROM, (sender_display, sender_email, sender_token_joined)),
+        (W_DOMAIN, (sender_domain,)),
+        (W_SUBJECT, (subject,)),
+        (W_BODY, (body_snippet,)),
+    )
+    for weight, haystacks in weighted_groups:
+        group_matches: set[str] = set()
+        for haystack in haystacks:
+            group_matches |= _matched_categories(haystack, context)
+        for category in group_matches:
+            scores[category] += weight
 
-    return score
+    return scores
 
 
 def _top_candidates_summary(scored: list[tuple[str, int]], limit: int = 3) -> str:
@@ -162,27 +477,42 @@ def _top_candidates_summary(scored: list[tuple[str, int]], limit: int = 3) -> st
     return ", ".join(f"{name}:{score}" for name, score in top) if top else ""
 
 
-def _is_junk(subject: str, body_snippet: str) -> tuple[bool, str]:
-    combined = f"{subject} {body_snippet}".lower()
-    has_unsubscribe = "unsubscribe" in combined
-    has_promo = any(word in combined for word in PROMOTIONAL_WORDS)
+def _is_junk(combined: bytes) -> tuple[bool, str]:
+    has_unsubscribe = b"unsubscribe" in combined
+
+    buckets = _scan_phrase_buckets(combined)
+    if buckets is None:
+        has_promo = _PROMO_RE.search(combined) is not None
+        has_scam = _SCAM_RE.search(combined) is not None
+    else:
+        has_promo = _PHRASE_BUCKET_PROMO in buckets
+        has_scam = _PHRASE_BUCKET_SCAM in buckets
+
     if has_unsubscribe and has_promo:
         return True, "unsubscribe + promotional language"
 
-    if any(phrase in combined for phrase in SCAM_PHRASES):
+    if has_scam:
         return True, "obvious scam phrase detected"
 
-    link_count = combined.count("http") + combined.count("www")
+    link_count = _count_link_markers(combined)
     if link_count >= LINK_DENSITY_THRESHOLD:
         return True, f"high link density ({link_count})"
 
     return False, "no junk indicators"
 
 
-def _priority_for_email(subject: str, body_snippet: str) -> tuple[str, str]:
-    combined = f"{subject} {body_snippet}".lower()
-    has_question = "?" in subject or "?" in body_snippet
-    has_action_language = any(phrase in combined for phrase in HIGH_PRIORITY_PHRASES)
+def _priority_for_email(
+    combined_text: str,
+    combined: bytes,
+) -> tuple[str, str]:
+    # The question check stays on the str form: the ASCII encoding maps
+    # non-ASCII characters to b"?", which would fake question marks.
+    has_question = "?" in combined_text
+    buckets = _scan_phrase_buckets(combined)
+    if buckets is None:
+        has_action_language = _HIPRI_RE.search(combined) is not None
+    else:
+        has_action_language = _PHRASE_BUCKET_HIPRI in buckets
 
     if has_question or has_action_language:
         return "high", "question/action language detected"
@@ -204,23 +534,103 @@ def _is_learnable_category(category: str, categories: list[str]) -> bool:
     return True
 
 
+def _finalize_learned_maps(
+    category_counts_by_domain: dict[str, dict[str, int]],
+    category_counts_by_from: dict[str, dict[str, int]],
+) -> tuple[dict[str, tuple[str, float, int]], dict[str, tuple[str, int]]]:
+    """Reduce per-sender/per-domain counts to (top category, ...) entries.
+
+    One fused pass per counts dict tracks the running total and running best,
+    replacing the separate sum() and key-lambda max() walks. Ties keep the
+    lexicographically larger category name, matching the old max() key.
+    """
+    from_map: dict[str, tuple[str, int]] = {}
+    for sender_email, by_category in category_counts_by_from.items():
+        best_category = ""
+        best_count = -1
+        for category, count in by_category.items():
+            if count > best_count or (count == best_count and category > best_category):
+                best_category = category
+                best_count = count
+        from_map[sender_email] = (best_category, best_count)
+
+    domain_map: dict[str, tuple[str, float, int]] = {}
+    for sender_domain, by_category in category_counts_by_domain.items():
+        total_count = 0
+        best_category = ""
+        best_count = -1
+        for category, count in by_category.items():
+            total_count += count
+            if count > best_count or (count == best_count and category > best_category):
+                best_category = category
+                best_count = count
+        ratio = (best_count / total_count) if total_count else 0.0
+        domain_map[sender_domain] = (best_category, ratio, total_count)
+
+    return domain_map, from_map
+
+
+def _read_samples_cache(cache_path: Path, cache_header: tuple) -> Any | None:
+    try:
+        with cache_path.open("rb") as handle:
+            header, payload = pickle.load(handle)
+    except Exception:
+        # Best-effort like tracing: a corrupt cache can fail in many ways
+        # (unpickling errors, unpacking a non-iterable payload, ...) and
+        # every one of them just means rebuilding from the JSON samples.
+        return None
+    if header != cache_header:
+        return None
+    return payload
+
+
+def _write_samples_cache(cache_path: Path, cache_header: tuple, payload: Any) -> None:
+    # Best-effort: classification proceeds unchanged if the cache can't be
+    # written. os.replace keeps the swap atomic for concurrent runs.
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        with tmp_path.open("wb") as handle:
+            pickle.dump((cache_header, payload), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        return
+
+
 def load_samples_map(
     samples_path: Path | str,
     categories: list[str],
 ) -> tuple[dict[str, tuple[str, float, int]], dict[str, tuple[str, int]]]:
     path = Path(samples_path)
+
+    # Samples change rarely; a pickle cache keyed on the file's stat and the
+    # category inventory skips the JSON parse and both counting passes on
+    # every run after the first.
+    cache_path = path.with_suffix(".cache.pkl")
+    cache_header: tuple | None
+    try:
+        stat = path.stat()
+        cache_header = (stat.st_mtime_ns, stat.st_size, tuple(categories))
+    except OSError:
+        cache_header = None
+
+    if cache_header is not None:
+        cached = _read_samples_cache(cache_path, cache_header)
+        if cached is not None:
+            _trace("samples cache hit: %s", cache_path)
+            return cached
+
     try:
         raw = path.read_text(encoding="utf-8")
         records = json.loads(raw)
     except FileNotFoundError:
-        _trace(f"samples warning: missing {path}; fallback to heuristics-only")
+        _trace("samples warning: missing %s; fallback to heuristics-only", path)
         return {}, {}
     except (OSError, ValueError, json.JSONDecodeError) as exc:
-        _trace(f"samples warning: invalid {path} ({exc}); fallback to heuristics-only")
+        _trace("samples warning: invalid %s (%s); fallback to heuristics-only", path, exc)
         return {}, {}
 
     if not isinstance(records, list):
-        _trace(f"samples warning: expected list in {path}; fallback to heuristics-only")
+        _trace("samples warning: expected list in %s; fallback to heuristics-only", path)
         return {}, {}
 
     category_counts_by_domain: dict[str, dict[str, int]] = {}
@@ -246,19 +656,10 @@ def load_samples_map(
             by_domain = category_counts_by_domain.setdefault(sender_domain, {})
             by_domain[category] = by_domain.get(category, 0) + 1
 
-    from_map: dict[str, tuple[str, int]] = {}
-    for sender_email, by_category in category_counts_by_from.items():
-        top_category, top_count = max(by_category.items(), key=lambda item: (item[1], item[0]))
-        from_map[sender_email] = (top_category, top_count)
-
-    domain_map: dict[str, tuple[str, float, int]] = {}
-    for sender_domain, by_category in category_counts_by_domain.items():
-        total_count = sum(by_category.values())
-        top_category, top_count = max(by_category.items(), key=lambda item: (item[1], item[0]))
-        ratio = (top_count / total_count) if total_count else 0.0
-        domain_map[sender_domain] = (top_category, ratio, total_count)
-
-    return domain_map, from_map
+    maps = _finalize_learned_maps(category_counts_by_domain, category_counts_by_from)
+    if cache_header is not None:
+        _write_samples_cache(cache_path, cache_header, maps)
+    return maps
 
 
 def _load_learned_maps(
@@ -310,34 +711,58 @@ def _build_maps_from_sample_records(
             by_domain = category_counts_by_domain.setdefault(sender_domain, {})
             by_domain[category] = by_domain.get(category, 0) + 1
 
-    from_map: dict[str, tuple[str, int]] = {}
-    for sender_email, by_category in category_counts_by_from.items():
-        top_category, top_count = max(by_category.items(), key=lambda item: (item[1], item[0]))
-        from_map[sender_email] = (top_category, top_count)
-
-    domain_map: dict[str, tuple[str, float, int]] = {}
-    for sender_domain, by_category in category_counts_by_domain.items():
-        total_count = sum(by_category.values())
-        top_category, top_count = max(by_category.items(), key=lambda item: (item[1], item[0]))
-        ratio = (top_count / total_count) if total_count else 0.0
-        domain_map[sender_domain] = (top_category, ratio, total_count)
-
-    return domain_map, from_map
+    return _finalize_learned_maps(category_counts_by_domain, category_counts_by_from)
 
 
 def label_email(
     email: dict[str, str],
-    categories: list[str],
+    categories: "list[str] | ClassifierContext",
     samples: Any = None,
 ) -> tuple[str, str, dict[str, str]]:
-    _validate_required_categories(categories)
-
+    if isinstance(categories, ClassifierContext):
+        context = categories
+    else:
+        context = build_context(categories, samples)
+
+    cache_key = (
+        email["from"],
+        email["subject"],
+        email["body"][:BODY_SNIPPET_CHARS],
+        context.categories,
+        context.samples_token,
+    )
+    cached = _LABEL_CACHE.get(cache_key)
+    if cached is not None:
+        _LABEL_CACHE.move_to_end(cache_key)
+        category, priority, meta = cached
+        _trace("label cache hit: duplicate email -> %s/%s", category, priority)
+        return category, priority, dict(meta)
+
+    category, priority, meta = _label_email_uncached(email, context)
+    # The cache keeps its own meta copy so a caller mutating the returned
+    # dict cannot poison later hits (which also hand out copies).
+    _LABEL_CACHE[cache_key] = (category, priority, dict(meta))
+    if len(_LABEL_CACHE) > _LABEL_CACHE_MAX:
+        _LABEL_CACHE.popitem(last=False)
+    return category, priority, meta
+
+
+def _label_email_uncached(
+    email: dict[str, str],
+    context: ClassifierContext,
+) -> tuple[str, str, dict[str, str]]:
     sender_display, sender_email, sender_domain, sender_token_joined = _extract_sender_parts(email["from"])
     subject = email["subject"].lower()
     body_snippet = email["body"][:BODY_SNIPPET_CHARS].lower()
+    # One combined haystack shared by the junk and priority scans, built
+    # once per email in both forms: the str for the question-mark check and
+    # its ASCII encoding for the byte scans (the phrase needles are ASCII,
+    # so replacement of exotic characters is safe).
+    combined_text = f"{subject} {body_snippet}"
+    combined = combined_text.encode("ascii", "replace")
 
-    is_junk, junk_reason = _is_junk(subject, body_snippet)
-    _trace(f"junk decision: {is_junk} ({junk_reason})")
+    is_junk, junk_reason = _is_junk(combined)
+    _trace("junk decision: %s (%s)", is_junk, junk_reason)
 
     if is_junk:
         _trace("top candidates: Junk override")
@@ -354,16 +779,14 @@ def label_email(
             },
         )
 
-    domain_map, from_map = _load_learned_maps(categories, samples)
-
-    from_match = from_map.get(sender_email)
+    from_match = context.from_map.get(sender_email)
     if from_match is not None:
         learned_category, hit_count = from_match
         if hit_count >= MIN_FROM_HITS:
-            priority, priority_reason = _priority_for_email(subject, body_snippet)
-            _trace(f"learned from-override: {sender_email} -> {learned_category} (hits={hit_count})")
-            _trace(f"final category: {learned_category} (from-override)")
-            _trace(f"priority decision: {priority} ({priority_reason})")
+            priority, priority_reason = _priority_for_email(combined_text, combined)
+            _trace("learned from-override: %s -> %s (hits=%d)", sender_email, learned_category, hit_count)
+            _trace("final category: %s (from-override)", learned_category)
+            _trace("priority decision: %s (%s)", priority, priority_reason)
             return (
                 learned_category,
                 priority,
@@ -375,17 +798,20 @@ def label_email(
                 },
             )
 
-    domain_match = domain_map.get(sender_domain)
+    domain_match = context.domain_map.get(sender_domain)
     if domain_match is not None:
         learned_category, ratio, total_count = domain_match
         if total_count >= MIN_DOMAIN_HITS and ratio >= MIN_DOMAIN_RATIO:
-            priority, priority_reason = _priority_for_email(subject, body_snippet)
+            priority, priority_reason = _priority_for_email(combined_text, combined)
             _trace(
-                f"learned domain-override: {sender_domain} -> {learned_category} "
-                f"(hits={total_count}, ratio={ratio:.2f})"
+                "learned domain-override: %s -> %s (hits=%d, ratio=%.2f)",
+                sender_domain,
+                learned_category,
+                total_count,
+                ratio,
             )
-            _trace(f"final category: {learned_category} (domain-override)")
-            _trace(f"priority decision: {priority} ({priority_reason})")
+            _trace("final category: %s (domain-override)", learned_category)
+            _trace("priority decision: %s (%s)", priority, priority_reason)
             return (
                 learned_category,
                 priority,
@@ -397,23 +823,21 @@ def label_email(
                 },
             )
 
-    scored = [
-        (
-            category,
-            _score_candidate(
-                category,
-                sender_display,
-                sender_email,
-                sender_domain,
-                sender_token_joined,
-                subject,
-                body_snippet,
-            ),
-        )
-        for category in _operational_candidates(categories)
-    ]
+    scores = _score_all_candidates(
+        context,
+        sender_display,
+        sender_email,
+        sender_domain,
+        sender_token_joined,
+        subject,
+        body_snippet,
+    )
 
-    scored.sort(key=lambda item: item[1], reverse=True)
+    # Only the top two scores feed the confidence decision and the summary
+    # shows three, so an O(N) top-3 selection replaces the full sort.
+    # nlargest is stable like the sort it replaces, preserving the candidate
+    # insertion order among ties.
+    scored = heapq.nlargest(3, scores.items(), key=lambda item: item[1])
     top_summary = _top_candidates_summary(scored)
 
     best_category = SPECIAL_CATEGORY_ARCHIVE
@@ -440,16 +864,16 @@ def label_email(
         confidence = "high"
         reason = f"strongest category score: {best_category} ({best_score})"
 
-    if selected_category not in categories:
+    if selected_category not in context.categories:
         raise ValueError(f"Classifier selected unknown category: {selected_category}")
 
-    priority, priority_reason = _priority_for_email(subject, body_snippet)
+    priority, priority_reason = _priority_for_email(combined_text, combined)
     if priority not in ALLOWED_PRIORITIES:
         raise ValueError(f"Classifier selected invalid priority: {priority}")
 
-    _trace(f"top candidates: {top_summary}")
-    _trace(f"final category: {selected_category} ({reason})")
-    _trace(f"priority decision: {priority} ({priority_reason})")
+    _trace("top candidates: %s", top_summary)
+    _trace("final category: %s (%s)", selected_category, reason)
+    _trace("priority decision: %s (%s)", priority, priority_reason)
 
     return (
         selected_category,
@@ -2,33 +2,92 @@
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import orjson
+except ImportError:
+    # Optional speedup; reads/writes fall back to the stdlib json module.
+    orjson = None
 
 
 def read_json(path: str | Path) -> Any:
     file_path = Path(path)
     try:
-        raw = file_path.read_text(encoding="utf-8")
+        raw = file_path.read_bytes()
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"JSON file not found: {file_path}") from exc
     except OSError as exc:
         raise OSError(f"Unable to read JSON file {file_path}: {exc}") from exc
 
     try:
+        # orjson.JSONDecodeError and json.JSONDecodeError are both ValueError.
+        if orjson is not None:
+            return orjson.loads(raw)
         return json.loads(raw)
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise ValueError(f"Invalid JSON in {file_path}: {exc}") from exc
 
 
 def write_json(path: str | Path, obj: Any) -> None:
     file_path = Path(path)
-    payload = json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
     try:
-        file_path.write_text(payload, encoding="utf-8")
+        if orjson is not None:
+            payload = orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+            )
+            file_path.write_bytes(payload)
+        else:
+            text = json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+            file_path.write_text(text, encoding="utf-8")
+    except OSError as exc:
+        raise OSError(f"Unable to write JSON file {file_path}: {exc}") from exc
+
+
+def iter_json_records(path: str | Path) -> Iterator[Any]:
+    """Yield one decoded record per non-empty line of a JSONL file.
+
+    Streams the file instead of materializing the whole list, so peak memory
+    stays constant regardless of input size.
+    """
+    file_path = Path(path)
+    try:
+        with file_path.open("rb") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    if orjson is not None:
+                        yield orjson.loads(line)
+                    else:
+                        yield json.loads(line)
+                except ValueError as exc:
+                    raise ValueError(
+                        f"Invalid JSON on line {line_number} of {file_path}: {exc}"
+                    ) from exc
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"JSON file not found: {file_path}") from exc
+
+
+def open_jsonl_writer(path: str | Path) -> BinaryIO:
+    """Open a buffered handle for append_jsonl; the caller owns closing it."""
+    file_path = Path(path)
+    try:
+        return file_path.open("wb", buffering=1 << 16)
     except OSError as exc:
         raise OSError(f"Unable to write JSON file {file_path}: {exc}") from exc
 
 
+def append_jsonl(handle: BinaryIO, obj: Any) -> None:
+    if orjson is not None:
+        handle.write(orjson.dumps(obj) + b"\n")
+    else:
+        handle.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
 def make_output_path(input_path: str | Path) -> Path:
     input_file = Path(input_path)
-    return input_file.with_name(f"{input_file.stem}.labeled.json")
+    suffix = ".jsonl" if input_file.suffix == ".jsonl" else ".json"
+    return input_file.with_name(f"{input_file.stem}.labeled{suffix}")
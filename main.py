@@ -2,50 +2,172 @@
 
 import sys
 import argparse
+import multiprocessing
+import os
+import traceback
 from pathlib import Path
 
-from Constants import CATEGORIES_FILE
-from classifier import label_email
-from io_utils import make_output_path, read_json, write_json
-from trace import _trace
+from Constants import (
+    ALLOWED_MUTABLE_FIELDS,
+    CATEGORIES_FILE,
+    PARALLEL_CHUNKSIZE,
+    PARALLEL_MIN_EMAILS,
+)
+from classifier import build_context, label_email
+from io_utils import (
+    append_jsonl,
+    iter_json_records,
+    make_output_path,
+    open_jsonl_writer,
+    read_json,
+    write_json,
+)
+from trace import _trace, merge_trace_shards
 from validation import (
-    enforce_only_labels_changed,
     validate_categories,
+    validate_email_record,
     validate_input_emails,
 )
 
 
-def run(input_json_file: str) -> Path:
+def _assert_labels_valid(email: dict[str, str]) -> None:
+    # Debug-mode stand-in for the old before/after field comparison: labels
+    # are now written by direct assignment, so only the two mutable fields
+    # can change and only their values need checking.
+    for field in ALLOWED_MUTABLE_FIELDS:
+        value = email.get(field)
+        assert isinstance(value, str) and value, f"invalid label field '{field}'"
+
+
+# Shared context for pool workers, built once per worker process by the
+# pool initializer so per-email labeling never repeats the setup work.
+_WORKER_CONTEXT = None
+
+
+def _init_worker_context(categories: list[str]) -> None:
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = build_context(categories)
+
+
+def _label_one(
+    indexed_email: tuple[int, dict[str, str]],
+) -> tuple[int, dict[str, str]]:
+    index, email = indexed_email
+    _trace("email %d start", index)
+    category, priority, _meta = label_email(email, _WORKER_CONTEXT)
+
+    email["category"] = category
+    email["priority"] = priority
+    if __debug__:
+        _assert_labels_valid(email)
+
+    _trace("email %d end", index)
+    return index, email
+
+
+def _label_emails_parallel(
+    emails: list[dict[str, str]],
+    categories: list[str],
+) -> list[dict[str, str]]:
+    _trace("parallel labeling across %s workers", os.cpu_count())
+
+    with multiprocessing.Pool(
+        initializer=_init_worker_context,
+        initargs=(categories,),
+    ) as pool:
+        indexed = list(
+            pool.imap_unordered(
+                _label_one,
+                enumerate(emails, start=1),
+                chunksize=PARALLEL_CHUNKSIZE,
+            )
+        )
+        pool.close()
+        pool.join()
+
+    # Workers each traced to their own shard; restore a single trace file.
+    merge_trace_shards()
+
+    indexed.sort(key=lambda item: item[0])
+    return [labeled_email for _, labeled_email in indexed]
+
+
+def _run_streaming(input_path: Path, categories: list[str]) -> Path:
+    """Label a JSONL input one record at a time with O(1) peak memory."""
+    context = build_context(categories)
+    output_path = make_output_path(input_path)
+
+    labeled_count = 0
+    with open_jsonl_writer(output_path) as writer:
+        for index, record in enumerate(iter_json_records(input_path), start=1):
+            email = validate_email_record(record)
+            email = {sys.intern(key): value for key, value in email.items()}
+
+            _trace("email %d start", index)
+            category, priority, _meta = label_email(email, context)
+
+            email["category"] = category
+            email["priority"] = priority
+            if __debug__:
+                _assert_labels_valid(email)
+
+            append_jsonl(writer, email)
+            labeled_count += 1
+            _trace("email %d end", index)
+
+    print(f"Labeled {labeled_count} emails (streaming)")
+    return output_path
+
+
+def run(input_json_file: str, stream: bool = False) -> Path:
     _trace("-------------------------") # run separator
     _trace("startup")
     print("Starting labeling run...")
 
     categories = validate_categories(read_json(CATEGORIES_FILE))
-    _trace(f"loaded categories from {CATEGORIES_FILE}")
+    _trace("loaded categories from %s", CATEGORIES_FILE)
 
     input_path = Path(input_json_file)
+
+    if stream or input_path.suffix == ".jsonl":
+        _trace("streaming input emails from %s", input_path)
+        output_path = _run_streaming(input_path, categories)
+        _trace("wrote output to %s", output_path)
+        print(f"Wrote labeled output to {output_path}")
+        return output_path
     emails = validate_input_emails(read_json(input_path))
-    _trace(f"loaded input emails from {input_path}")
+    # Intern the known field keys so per-email dict lookups in the classifier
+    # hit the identity fast path.
+    emails = [
+        {sys.intern(key): value for key, value in email.items()} for email in emails
+    ]
+    _trace("loaded input emails from %s", input_path)
 
     print(f"Loaded {len(categories)} categories")
     print(f"Loaded {len(emails)} emails")
 
-    labeled_emails: list[dict[str, str]] = []
-    for index, email in enumerate(emails, start=1):
-        _trace(f"email {index} start")
-        category, priority, _meta = label_email(email, categories)
+    if len(emails) >= PARALLEL_MIN_EMAILS:
+        labeled_emails = _label_emails_parallel(emails, categories)
+    else:
+        # One-time validation, candidate prep, and samples-map loading; the
+        # context is shared by every label_email call in the loop.
+        context = build_context(categories)
+
+        for index, email in enumerate(emails, start=1):
+            _trace("email %d start", index)
+            category, priority, _meta = label_email(email, context)
 
-        updated_email = dict(email)
-        updated_email["category"] = category
-        updated_email["priority"] = priority
+            email["category"] = category
+            email["priority"] = priority
+            if __debug__:
+                _assert_labels_valid(email)
 
-        enforce_only_labels_changed(email, updated_email)
-        labeled_emails.append(updated_email)
-        _trace(f"email {index} end")
+            _trace("email %d end", index)
+        labeled_emails = emails
 
     output_path = make_output_path(input_path)
     write_json(output_path, labeled_emails)
-    _trace(f"wrote output to {output_path}")
+    _trace("wrote output to %s", output_path)
 
     print(f"Wrote labeled output to {output_path}")
     return output_path
@@ -61,12 +183,19 @@ def main() -> int:
         help="Path to input JSON file containing unsolved emails.",
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Treat the input as line-delimited JSON and stream records "
+        "(implied by a .jsonl input extension).",
+    )
+
     args = parser.parse_args()
 
     try:
-        run(args.input_file)
+        run(args.input_file, stream=args.stream)
     except Exception as exc:
-        _trace("Error:\n" + traceback.format_exc())
+        _trace("Error:\n%s", traceback.format_exc())
         print(f"Error: {exc}\nSee trace.txt for details.")
         return 1
         
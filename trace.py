@@ -1,16 +1,80 @@
 """Best-effort append-only tracing utilities."""
 
+import atexit
+import os
+import threading
 from datetime import datetime, timezone
 
-from Constants import TRACE_FILE
+from Constants import TRACE_ENABLED, TRACE_FILE
 
+_HANDLE = None
+_HANDLE_PID = None
+_LOCK = threading.Lock()
+_MAIN_PID = os.getpid()
 
-def _trace(msg: str) -> None:
+
+def _close() -> None:
+    global _HANDLE
+    with _LOCK:
+        if _HANDLE is not None:
+            try:
+                _HANDLE.close()
+            except Exception:
+                pass
+            _HANDLE = None
+
+
+def _open():
+    # Open once with a large buffer instead of per-line open/close syscalls;
+    # the atexit hook flushes whatever is still buffered at interpreter exit.
+    # Pool workers write line-buffered per-PID shards because forked children
+    # exit via os._exit and never run atexit hooks. A forked child also
+    # inherits the parent's handle (and its unflushed buffer), so the handle
+    # is abandoned -- not closed -- whenever the PID no longer matches.
+    global _HANDLE, _HANDLE_PID
+    pid = os.getpid()
+    if _HANDLE is None or _HANDLE_PID != pid:
+        if pid == _MAIN_PID:
+            _HANDLE = TRACE_FILE.open("a", encoding="utf-8", buffering=1 << 16)
+            atexit.register(_close)
+        else:
+            shard = TRACE_FILE.with_name(f"{TRACE_FILE.stem}.{pid}{TRACE_FILE.suffix}")
+            _HANDLE = shard.open("a", encoding="utf-8", buffering=1)
+        _HANDLE_PID = pid
+    return _HANDLE
+
+
+def merge_trace_shards() -> None:
+    """Fold per-worker trace shards (trace.<pid>.txt) into the main trace file."""
+    if not TRACE_ENABLED:
+        return
+    try:
+        pattern = f"{TRACE_FILE.stem}.[0-9]*{TRACE_FILE.suffix}"
+        shards = sorted(TRACE_FILE.parent.glob(pattern))
+        with _LOCK:
+            handle = _open()
+            for shard in shards:
+                try:
+                    handle.write(shard.read_text(encoding="utf-8"))
+                    shard.unlink()
+                except OSError:
+                    continue
+    except Exception:
+        # Tracing should never impact program success.
+        return
+
+
+def _trace(fmt: str, *args: object) -> None:
+    # Callers pass %-style format arguments separately so that a disabled
+    # trace skips all string formatting, not just the file write.
+    if not TRACE_ENABLED:
+        return
+    msg = fmt % args if args else fmt
     timestamp = datetime.now(timezone.utc).isoformat()
     line = f"[{timestamp}] {msg}\n"
     try:
-        with TRACE_FILE.open("a", encoding="utf-8") as handle:
-            handle.write(line)
+        with _LOCK:
+            _open().write(line)
     except Exception:
         # Tracing should never impact program success.
         return
@@ -1,62 +1,264 @@
-"""Validation functions for scaffold phase."""
+"""Validation functions for scaffold phase.
 
-from typing import Any
+Public entry points take `object` and narrow with isinstance, so a
+compiled build (mypyc/Cython) can lower the checks to direct C type tests
+instead of Any-typed dynamic dispatch.
+"""
+
+import json
+from typing import Annotated, Any
 
 from Constants import ALLOWED_MUTABLE_FIELDS, REQUIRED_EMAIL_FIELDS
 
+# Hoisted once so the per-record loops iterate flat tuples and test against
+# prebuilt sets instead of rebuilding them per call.
+_REQUIRED: tuple[str, ...] = tuple(REQUIRED_EMAIL_FIELDS)
+_MUTABLE: frozenset[str] = frozenset(ALLOWED_MUTABLE_FIELDS)
+_REQUIRED_IMMUTABLE: tuple[str, ...] = tuple(
+    field for field in _REQUIRED if field not in _MUTABLE
+)
+_REQUIRED_SET: frozenset[str] = frozenset(_REQUIRED)
+
+try:
+    import msgspec
+except ImportError:
+    # Optional speedup; record validation falls back to pure-Python checks.
+    msgspec = None
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional speedup for the bulk validation entry point.
+    np = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    # Second-choice optional speedup behind msgspec; compiles the record
+    # schema to specialized Python once at import.
+    fastjsonschema = None
+
+if fastjsonschema is not None:
+    _EMAIL_SCHEMA = {
+        "type": "object",
+        "required": list(_REQUIRED),
+        "properties": (
+            {key: {"type": "string", "minLength": 1} for key in _REQUIRED_IMMUTABLE}
+            | {key: {"type": "string"} for key in sorted(_MUTABLE)}
+        ),
+        "additionalProperties": True,
+    }
+    _validate_email_schema = fastjsonschema.compile(_EMAIL_SCHEMA)
+else:
+    _validate_email_schema = None
+
+if msgspec is not None:
+    _NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
+
+    class _EmailRecord(msgspec.Struct, kw_only=True):
+        """Schema mirror of REQUIRED_EMAIL_FIELDS; conversion is the check.
+
+        Unknown keys are ignored, matching the dict validator, and the
+        min_length constraint encodes the may-not-be-empty rule for the
+        immutable fields. Instances are discarded: the pipeline keeps
+        operating on the original dicts.
+        """
 
-def validate_categories(categories: Any) -> list[str]:
+        date: _NonEmptyStr
+        from_: _NonEmptyStr = msgspec.field(name="from")
+        subject: _NonEmptyStr
+        priority: str
+        category: str
+        body: _NonEmptyStr
+
+    # Untyped C-level JSON decoder for the bytes entry point; records stay
+    # plain dicts so extra keys and the existing error messages survive.
+    _JSON_DECODER = msgspec.json.Decoder()
+
+
+def validate_categories(categories: object) -> list[str]:
     if not isinstance(categories, list) or not categories:
         raise ValueError("categories.json must contain a non-empty JSON list of strings")
 
-    invalid = [item for item in categories if not isinstance(item, str)]
-    if invalid:
-        raise ValueError("categories.json entries must all be strings")
+    for item in categories:
+        # Exact type check plus early exit: no invalid-list allocation, and
+        # the error path stops at the first bad entry.
+        if type(item) is not str:
+            raise ValueError("categories.json entries must all be strings")
 
     return categories
 
 
-def validate_email_record(email: Any) -> dict[str, str]:
+def _raise_missing_keys(email: dict[str, Any]) -> None:
+    # Error paths own all message formatting and list building: a record
+    # that validates cleanly must not allocate anything beyond the checks
+    # themselves. The ordered missing list is reconstructed here, off the
+    # hot path, after the issubset guard has already failed.
+    missing = [key for key in _REQUIRED if key not in email]
+    raise ValueError(f"Email record missing required keys: {missing}")
+
+
+def _build_record_validator():
+    # Partial-evaluate the field loop for the fixed schema: emit one
+    # straight-line check block per field and exec it into a function, so
+    # per-record validation runs no loop dispatch at all. The exact type
+    # check is safe because JSON decoding never produces str subclasses.
+    lines = [
+        "def _validate_email_record_fast(email):",
+        "    if not _REQUIRED_SET.issubset(email):",
+        "        _raise_missing_keys(email)",
+    ]
+    for key in _REQUIRED:
+        lines.append(f"    value = email[{key!r}]")
+        lines.append("    if value.__class__ is not str:")
+        lines.append(f"        raise ValueError(\"Email field '{key}' must be a string\")")
+        if key not in _MUTABLE:
+            lines.append("    if not value:")
+            lines.append(f"        raise ValueError(\"Email field '{key}' may not be empty\")")
+    lines.append("    return email")
+
+    namespace = {
+        "_REQUIRED_SET": _REQUIRED_SET,
+        "_raise_missing_keys": _raise_missing_keys,
+    }
+    exec(compile("\n".join(lines), "<email record validator>", "exec"), namespace)
+    return namespace["_validate_email_record_fast"]
+
+
+_validate_email_record_fast = _build_record_validator()
+
+
+def validate_email_record(email: object) -> dict[str, str]:
     if not isinstance(email, dict):
         raise ValueError("Each email record must be a JSON object")
 
-    missing = [key for key in REQUIRED_EMAIL_FIELDS if key not in email]
-    if missing:
-        raise ValueError(f"Email record missing required keys: {missing}")
+    if msgspec is not None:
+        try:
+            msgspec.convert(email, _EmailRecord)
+        except msgspec.ValidationError:
+            # Rare path: rerun the pure-Python checks so rejected records
+            # raise the same ValueError messages as before.
+            return _validate_email_record_fast(email)
+        return email
+
+    if _validate_email_schema is not None:
+        try:
+            _validate_email_schema(email)
+        except fastjsonschema.JsonSchemaException:
+            return _validate_email_record_fast(email)
+        return email
+
+    return _validate_email_record_fast(email)
 
-    for key in REQUIRED_EMAIL_FIELDS:
-        value = email[key]
-        if not isinstance(value, str):
-            raise ValueError(f"Email field '{key}' must be a string")
-        if key not in {"category", "priority"} and value == "":
-            raise ValueError(f"Email field '{key}' may not be empty")
 
-    return email
+# Records already validated during the current validate_input_emails call,
+# keyed by object id with the dict length as a cheap mutation tripwire. The
+# memo is only consulted within one batch -- the input list keeps every
+# record alive for its duration, so ids cannot be recycled -- and is cleared
+# on entry so stale ids from freed dicts never leak across calls.
+_VALIDATED_IDS: dict[int, int] = {}
+
+
+def _validate_email_record_memo(email: Any) -> dict[str, str]:
+    # Non-dict entries skip the memo entirely so they raise the validator's
+    # own ValueError instead of failing the len() probe with a TypeError.
+    if not isinstance(email, dict):
+        return validate_email_record(email)
+    key = id(email)
+    if _VALIDATED_IDS.get(key) == len(email):
+        return email
+    result = validate_email_record(email)
+    _VALIDATED_IDS[key] = len(email)
+    return result
+
 
+def validate_input_emails(emails: object) -> list[dict[str, str]]:
+    """Validate the decoded input list.
 
-def validate_input_emails(emails: Any) -> list[dict[str, str]]:
-    if not isinstance(emails, list):
+    The returned records are owned by the labeling pipeline and may be
+    mutated in place (category/priority assignment) without copying.
+    Records that appear multiple times by reference are validated once.
+    """
+    if not isinstance(emails, (list, tuple)):
         raise ValueError("Input file must contain a JSON list of email objects")
-    return [validate_email_record(email) for email in emails]
+    _VALIDATED_IDS.clear()
+    # map() drives the per-record calls from C instead of an eval-loop
+    # iteration per email; validate_email_record keeps the non-dict check
+    # and the tiered fast paths.
+    return list(map(_validate_email_record_memo, emails))
+
+
+def validate_input_emails_from_bytes(buf: bytes) -> list[dict[str, str]]:
+    """Decode a JSON buffer and validate it in one call.
+
+    Collapses the read -> json.loads -> validate round-trip for callers
+    that already hold the raw bytes. With msgspec the parse happens in its
+    C decoder and each record's field checks run through the Struct
+    conversion inside validate_email_record, so the whole path avoids
+    per-field Python dispatch; otherwise the stdlib decoder feeds the
+    normal validators. Error messages match the existing entry points.
+    """
+    if msgspec is not None:
+        try:
+            decoded = _JSON_DECODER.decode(buf)
+        except msgspec.DecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+    else:
+        try:
+            decoded = json.loads(buf)
+        except ValueError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+    return validate_input_emails(decoded)
+
+
+def validate_input_emails_bulk(emails: object) -> list[dict[str, str]]:
+    """Opt-in column-wise variant of validate_input_emails.
+
+    With numpy available, each required field is pulled into one column,
+    swept with an exact str type check, and then emptiness-tested as a
+    single vectorized comparison. The type sweep is mandatory: numpy
+    coerces mixed columns to a string dtype, so the dtype alone proves
+    nothing about the element types. Any anomaly -- non-dict record,
+    missing key, wrong type, empty immutable field -- delegates to the
+    per-record validator so the error message is identical to the scalar
+    path. The records returned are the same dicts that were passed in.
+    """
+    if np is None or not isinstance(emails, list) or not emails:
+        return validate_input_emails(emails)
+
+    for key in _REQUIRED:
+        try:
+            values = [email[key] for email in emails]
+        except (KeyError, TypeError):
+            return validate_input_emails(emails)
+        if not all(value.__class__ is str for value in values):
+            return validate_input_emails(emails)
+        if key not in _MUTABLE and (np.array(values) == "").any():
+            return validate_input_emails(emails)
+
+    return emails
 
 
 def enforce_only_labels_changed(
     original: dict[str, Any],
     labeled: dict[str, Any],
 ) -> None:
-    if set(original.keys()) != set(labeled.keys()):
+    # Dict key views compare as sets without materializing new set objects.
+    if original.keys() != labeled.keys():
         raise ValueError("Labeled email must preserve exactly the same keys")
 
+    # Every key is compared -- records may carry extra fields beyond the
+    # required ones -- but the mutable-set probe only runs for values that
+    # actually differ, instead of once per key.
     for key, original_value in original.items():
-        labeled_value = labeled[key]
-        if key in ALLOWED_MUTABLE_FIELDS:
-            continue
-        if original_value != labeled_value:
+        if original_value != labeled[key] and key not in _MUTABLE:
             raise ValueError(
                 f"Only category/priority may change; field '{key}' was modified"
             )
 
-    for field in ALLOWED_MUTABLE_FIELDS:
+    for field in _MUTABLE:
         value = labeled.get(field)
-        if not isinstance(value, str) or value == "":
+        # Pointer compare plus C-level length check, matching the exact-str
+        # convention used by the record validators.
+        if value.__class__ is not str or not value:
             raise ValueError(f"Labeled field '{field}' must be a non-empty string")